@@ -1,8 +1,9 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
+import pyarrow as pa
 import re
+import io
 from src.loader import load_csvs, normalize_to_transactions
 from src.engine import FIFOEngine
 from src.analytics import calculate_portfolio_performance
@@ -27,29 +28,258 @@ deposits_as_returns = st.sidebar.checkbox(
     help="If checked, Deposits will NOT add new assets to your inventory. Use this if you are just moving assets BACK from your Cold Wallet to the Exchange, to avoid double counting."
 )
 
-def is_valid_hex_tx(tx_string):
-    """Checks if the string is a valid 64-character hex string (likely a blockchain hash)."""
-    if not tx_string:
-        return False
-    # Bitcoin TxID is usually 64 hex chars.
-    return bool(re.fullmatch(r'^[0-9a-fA-F]{64}$', str(tx_string)))
+# Bitcoin TxID is usually 64 hex chars. Compiled once, applied column-wise via str.fullmatch.
+_HEX64 = re.compile(r'[0-9a-fA-F]{64}')
+
+@st.cache_data(show_spinner=False)
+def _load_and_normalize(file_bytes_tuple):
+    """
+    Parses uploaded CSVs and normalizes them to Transactions.
+    Keyed on (name, bytes) pairs so reruns with the same uploads hit the cache.
+    Returns (df, transactions, all_assets).
+    """
+    df = load_csvs([io.BytesIO(data) for _, data in file_bytes_tuple], use_pyarrow=True)
+    if df.empty:
+        return df, [], ()
+    transactions = normalize_to_transactions(df)
+    all_assets = tuple(sorted({t.asset for t in transactions}))
+    return df, transactions, all_assets
+
+@st.cache_data(show_spinner=False)
+def _run_engine(tx_tuple, w_as_t, d_as_t):
+    """
+    Runs the FIFO engine over the (filtered) transactions.
+    Cached on the transactions and settings, so unrelated widget changes skip the re-run.
+    Returns (history_df, realized_gains_df, holdings_df, realized_assets).
+    """
+    engine = FIFOEngine(list(tx_tuple), withdrawals_as_transfers=w_as_t, deposits_as_transfers=d_as_t)
+    engine.run()
+    holdings_df = engine.get_holdings_summary()
+    
+    # --- DEFENSIVE CAST TO FLOAT ---
+    # Ensure absolutely no Decimals remain to prevent TypeErrors (single pass, once per cache key)
+    cols = [c for c in ['Quantity', 'Unit Price', 'Market Value', 'Cost Basis', 'Avg Buy Price', 'Unrealized Gain'] if c in holdings_df.columns]
+    if cols:
+        holdings_df[cols] = holdings_df[cols].apply(pd.to_numeric, errors='coerce')
+    
+    realized_gains_df = engine.get_realized_gains_df()
+    realized_assets = tuple(sorted(pd.unique(realized_gains_df['asset']))) if not realized_gains_df.empty else ()
+    
+    return engine.get_history_df(), realized_gains_df, holdings_df, realized_assets
+
+@st.cache_data(ttl=3600, show_spinner="Fetching historical prices from Yahoo Finance...")
+def _perf(history_df):
+    """
+    Daily performance series with external pricing.
+    Cached for an hour on the history contents to avoid re-fetching prices every rerun.
+    """
+    return calculate_portfolio_performance(history_df)
+
+@st.cache_data(show_spinner=False)
+def _build_tx_df(tx_tuple):
+    """
+    Builds the Transactions tab DataFrame, including the Explorer link column.
+    tx_tuple rows: (timestamp, type, asset, amount, fee, fiat_value, txid, refid),
+    numerics as strings so the whole key stays cheap to hash.
+    """
+    dates, types, assets, amounts, fees, fiat_values, txids, refids = zip(*tx_tuple)
+    
+    # Build columns in one pass each rather than a dict per row.
+    # Arrow-backed with an explicit schema so st.dataframe can ship it without another conversion.
+    # from_pandas=True: a missing (None/NaN) text cell becomes null instead of failing the whole table.
+    tbl = pa.table({
+        'Date': pa.array(dates, type=pa.timestamp('ns')),
+        'Type': pa.array(types, type=pa.string(), from_pandas=True),
+        'Asset': pa.array(assets, type=pa.string(), from_pandas=True),
+        'Amount': pa.array(np.asarray(amounts, dtype=float), type=pa.float64()),
+        'Fee': pa.array(np.asarray(fees, dtype=float), type=pa.float64()),
+        'Fiat Value': pa.array(np.asarray(fiat_values, dtype=float), type=pa.float64()),
+        'TxID': pa.array(txids, type=pa.string(), from_pandas=True),
+        'RefID': pa.array(refids, type=pa.string(), from_pandas=True),
+    })
+    tx_df = tbl.to_pandas(types_mapper=pd.ArrowDtype)
+    
+    # LINK LOGIC
+    # Validate if txid is a valid hex hash for Blockchain (64 chars, hex)
+    # If not, try refid (Often Kraken refid is the real blockchain hash for deposits/withdrawals)
+    is_btc = (tx_df['Asset'] == 'BTC').fillna(False).to_numpy(dtype=bool)
+    txid_ok = tx_df['TxID'].str.fullmatch(_HEX64.pattern).fillna(False).to_numpy(dtype=bool)
+    refid_ok = tx_df['RefID'].str.fullmatch(_HEX64.pattern).fillna(False).to_numpy(dtype=bool)
+    
+    target_hash = tx_df['TxID'].where(txid_ok, tx_df['RefID'])
+    has_link = is_btc & (txid_ok | refid_ok)
+    tx_df['Explorer'] = ("https://mempool.space/tx/" + target_hash).where(has_link)
+    return tx_df
+
+# --- Cached Figures ---
+# Plotly figure construction (and its JSON serialization) is not free, so figures are
+# memoized on their input data and only rebuilt when that data changes.
+# Plotly itself is imported lazily here so the landing page doesn't pay for it.
+# Resource caches are process-wide and shared by all sessions, so each keeps only
+# the few most recent figures.
+_FIG_CACHE_ENTRIES = 8
+
+@st.cache_resource(max_entries=_FIG_CACHE_ENTRIES, show_spinner=False)
+def _growth_fig(df):
+    import plotly.express as px
+    return px.line(df, y=['total_cost_basis', 'total_market_value'], title="Cost Basis vs Market Value")
+
+@st.cache_resource(max_entries=_FIG_CACHE_ENTRIES, show_spinner=False)
+def _gains_fig(df):
+    import plotly.express as px
+    return px.area(df, y='total_realized_gain', title="Cumulative Realized Gains")
+
+@st.cache_resource(max_entries=_FIG_CACHE_ENTRIES, show_spinner=False)
+def _pie_fig(df):
+    import plotly.express as px
+    return px.pie(df, values='Market Value', names='Asset', title='Portfolio Allocation (Market Value)')
+
+@st.cache_resource(max_entries=_FIG_CACHE_ENTRIES, show_spinner=False)
+def _asset_fig(df, asset):
+    """df holds only the asset's _cb and _mv columns, keeping the cache key small."""
+    import plotly.graph_objects as go
+    # Plain ndarrays skip Plotly's pandas conversion; Scattergl renders long daily series via WebGL
+    x = df.index.to_numpy()
+    cb = df[f"{asset}_cb"].to_numpy()
+    mv = df[f"{asset}_mv"].to_numpy()
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=x, y=cb, mode='lines', name='Cost Basis'))
+    fig.add_trace(go.Scattergl(x=x, y=mv, mode='lines', name='Market Value'))
+    fig.update_layout(title=f"{asset} - Cost Basis vs Market Value", hovermode="x unified")
+    return fig
+
+@st.cache_data(show_spinner=False)
+def _filter_gains(df, assets_tuple):
+    """
+    Realized gains rows for the selected assets, plus their total gain.
+    Returns (display_df, total_gain).
+    """
+    m = df['asset'].isin(assets_tuple)
+    display_cols = ['date', 'asset', 'quantity', 'proceeds', 'cost_basis', 'gain_usd', 'tx_type']
+    display_df = df.loc[m, [c for c in display_cols if c in df.columns]]
+    return display_df, float(df.loc[m, 'gain_usd'].sum())
+
+# --- Tab Fragments ---
+# Each tab with its own widgets renders as a fragment, so interacting with it
+# reruns only that tab instead of the whole pipeline.
+
+@st.fragment
+def _render_tab3(daily_df, holdings_df, available_assets):
+    """Asset Explorer tab. Selectbox changes rerun only this fragment."""
+    st.subheader("Asset Explorer")
+    if available_assets:
+        # Default index: try to respect filter logic if possible, or just default to first
+        default_idx = 0
+        
+        selected_asset = st.selectbox("Select Asset to View Details", available_assets, index=default_idx)
+        
+        st.markdown(f"### {selected_asset} Performance")
+        
+        # --- Per-Asset Metrics (Moved from Top) ---
+        if not holdings_df.empty:
+             row = holdings_df[holdings_df['Asset'] == selected_asset]
+             if not row.empty:
+                 asset_row = row.iloc[0]
+                 m1, m2, m3 = st.columns(3)
+                 m1.metric("Quantity Held", f"{asset_row['Quantity']:,.8f} {selected_asset}")
+                 m2.metric("Avg Buy Price", f"${asset_row['Avg Buy Price']:,.2f}")
+                 m3.metric("Current Price", f"${asset_row['Unit Price']:,.2f}")
+             else:
+                 st.info(f"No current holdings of {selected_asset} (Sold out or Historic only).")
+        
+        st.divider()
+        
+        cb_col = f"{selected_asset}_cb"
+        mv_col = f"{selected_asset}_mv"
+        
+        if cb_col in daily_df.columns and mv_col in daily_df.columns:
+            fig_asset = _asset_fig(daily_df[[cb_col, mv_col]], selected_asset)
+            st.plotly_chart(fig_asset, use_container_width=True)
+        else:
+            st.warning(f"No detailed history found for {selected_asset}")
+    else:
+        st.info("No assets found in history.")
+
+@st.fragment
+def _render_tab4(realized_gains_df, realized_assets):
+    """Realized Gains tab. Filter changes rerun only this fragment."""
+    st.subheader("Realized Gains Log")
+    selected_assets = st.multiselect("Filter by Asset", realized_assets, default=realized_assets)
+    
+    if not realized_gains_df.empty:
+        display_df, total_selected_gain = _filter_gains(realized_gains_df, tuple(selected_assets))
+        
+        # INCREASED PRECISION
+        st.dataframe(
+            display_df,
+            column_config={
+                "quantity": st.column_config.NumberColumn("quantity", format="localized", step=1e-8),
+                "proceeds": st.column_config.NumberColumn("proceeds", format="dollar"),
+                "cost_basis": st.column_config.NumberColumn("cost_basis", format="dollar"),
+                "gain_usd": st.column_config.NumberColumn("gain_usd", format="dollar")
+            }
+        )
+        
+        if not display_df.empty:
+            st.metric(f"Realized Gain ({', '.join(selected_assets) if len(selected_assets) < 5 else 'Selected'})", f"${total_selected_gain:,.2f}")
+    else:
+        st.info("No realized gains yet.")
+
+@st.fragment
+def _render_tab5(transactions):
+    """Transactions tab."""
+    st.subheader("Transaction History")
+    
+    # Convert list of transactions objects to DataFrame
+    if transactions:
+        tx_tuple = tuple(
+            (t.timestamp, t.type, t.asset, str(t.amount), str(t.fee),
+             str(t.fiat_value) if t.fiat_value is not None else '0', t.txid, t.refid)
+            for t in transactions
+        )
+        tx_df = _build_tx_df(tx_tuple)
+        
+        # Display with Column Config for Links
+        st.dataframe(
+            tx_df,
+            column_config={
+                "Explorer": st.column_config.LinkColumn("Explorer", display_text="Mempool.space"),
+                "Amount": st.column_config.NumberColumn("Amount", format="%.8f"),
+                "Fee": st.column_config.NumberColumn("Fee", format="%.8f"),
+                "Fiat Value": st.column_config.NumberColumn("Fiat Value", format="$%.2f"),
+                "Date": st.column_config.DatetimeColumn("Date", format="D MMM YYYY, HH:mm")
+            },
+            column_order=['Date', 'Type', 'Asset', 'Amount', 'Fee', 'Fiat Value', 'Explorer', 'TxID', 'RefID'],
+            use_container_width=True
+        )
+        
+        st.caption(f"Showing {len(tx_df)} transactions.")
+    else:
+        st.info("No transactions to display.")
 
 if uploaded_files:
     with st.spinner("Loading and processing data..."):
         # Load Data
-        df = load_csvs(uploaded_files)
+        # Fast path: same uploads as the last rerun -> reuse the parsed result from session state
+        # without re-reading or re-hashing the file bytes. Otherwise fall back to the content cache.
+        upload_key = tuple((f.file_id, f.name, f.size) for f in uploaded_files)
+        if st.session_state.get('_csv_key') == upload_key:
+            df, transactions, all_assets = st.session_state['_csv_data']
+        else:
+            file_bytes_tuple = tuple((f.name, f.getvalue()) for f in uploaded_files)
+            df, transactions, all_assets = _load_and_normalize(file_bytes_tuple)
+            st.session_state['_csv_key'] = upload_key
+            st.session_state['_csv_data'] = (df, transactions, all_assets)
         
         if df.empty:
             st.error("No data found in uploaded files.")
         else:
             try:
-                transactions = normalize_to_transactions(df)
-                
                 # Toast for successful load
                 st.toast(f"Loaded {len(transactions)} transactions.", icon='✅')
                 
                 # --- ASSET FILTER ---
-                all_assets = sorted(list(set(t.asset for t in transactions)))
                 # Default to BTC if present, else All
                 default_sel = ['BTC'] if 'BTC' in all_assets else all_assets
                 
@@ -61,51 +291,37 @@ if uploaded_files:
                 )
                 
                 if selected_assets_filter:
-                    transactions = [t for t in transactions if t.asset in selected_assets_filter]
+                    # The engine needs Transaction objects, so filter the object list directly (hashed membership)
+                    selected_set = frozenset(selected_assets_filter)
+                    transactions = [t for t in transactions if t.asset in selected_set]
                 
                 st.toast(f"Analyzing {len(transactions)} transactions for: {', '.join(selected_assets_filter)}", icon='ℹ️')
 
-                # Run Engine
-                engine = FIFOEngine(transactions, withdrawals_as_transfers=withdrawals_as_held, deposits_as_transfers=deposits_as_returns)
-                engine.run()
-                
-                # Metrics
-                history_df = engine.get_history_df()
-                realized_gains_df = engine.get_realized_gains_df()
-                holdings_df = engine.get_holdings_summary()
+                # Run Engine (cached on transactions + settings)
+                history_df, realized_gains_df, holdings_df, realized_assets = _run_engine(
+                    tuple(transactions), withdrawals_as_held, deposits_as_returns
+                )
                 
-                # --- DEFENSIVE CAST TO FLOAT ---
-                # Ensure absolutely no Decimals remain to prevent TypeErrors
-                for c in ['Quantity', 'Unit Price', 'Market Value', 'Cost Basis', 'Avg Buy Price', 'Unrealized Gain']:
-                    if c in holdings_df.columns:
-                        holdings_df[c] = holdings_df[c].astype(float)
-
                 # Daily series with External Pricing
-                with st.spinner("Fetching historical prices from Yahoo Finance..."):
-                     daily_df = calculate_portfolio_performance(history_df)
+                daily_df = _perf(history_df)
+                available_assets = tuple(c[:-4] for c in daily_df.columns if c.endswith('_qty'))
                 
                 # --- SYNC HOLDINGS WITH FRESH PRICES ---
                 if not daily_df.empty and not holdings_df.empty:
                     latest_row = daily_df.iloc[-1]
                     
-                    for asset in holdings_df['Asset']:
-                        qty_col = f"{asset}_qty"
-                        mv_col = f"{asset}_mv"
+                    assets = holdings_df['Asset'].to_numpy()
+                    # Missing columns reindex to NaN, which the mask below excludes
+                    qty = latest_row.reindex([f"{a}_qty" for a in assets]).to_numpy(dtype=float)
+                    mv = latest_row.reindex([f"{a}_mv" for a in assets]).to_numpy(dtype=float)
+                    
+                    mask = (qty > 0) & ~np.isnan(mv)
+                    if mask.any():
+                        price = mv[mask] / qty[mask]
                         
-                        if qty_col in daily_df.columns and mv_col in daily_df.columns:
-                            # Safe access with valid columns
-                            qty = latest_row[qty_col]
-                            mv = latest_row[mv_col]
-                            
-                            idx = holdings_df[holdings_df['Asset'] == asset].index
-                            
-                            if qty > 0:
-                                price = mv / qty
-                                
-                                # Direct float assignment safe now
-                                holdings_df.loc[idx, 'Unit Price'] = price
-                                holdings_df.loc[idx, 'Market Value'] = holdings_df.loc[idx, 'Quantity'] * price
-                                holdings_df.loc[idx, 'Unrealized Gain'] = holdings_df.loc[idx, 'Market Value'] - holdings_df.loc[idx, 'Cost Basis']
+                        holdings_df.loc[mask, 'Unit Price'] = price
+                        holdings_df.loc[mask, 'Market Value'] = holdings_df.loc[mask, 'Quantity'].to_numpy() * price
+                        holdings_df.loc[mask, 'Unrealized Gain'] = holdings_df.loc[mask, 'Market Value'] - holdings_df.loc[mask, 'Cost Basis']
 
                 # --- Dashboard ---
                 
@@ -128,11 +344,11 @@ if uploaded_files:
                 with tab1:
                     st.subheader("Portfolio Growth Over Time")
                     if not daily_df.empty:
-                        fig_growth = px.line(daily_df, y=['total_cost_basis', 'total_market_value'], title="Cost Basis vs Market Value")
+                        fig_growth = _growth_fig(daily_df)
                         st.plotly_chart(fig_growth, use_container_width=True)
                         
                         st.subheader("Cumulative Realized Gains")
-                        fig_gains = px.area(daily_df, y='total_realized_gain', title="Cumulative Realized Gains")
+                        fig_gains = _gains_fig(daily_df)
                         st.plotly_chart(fig_gains, use_container_width=True)
                     else:
                         st.info("Not enough data for chart.")
@@ -146,144 +362,35 @@ if uploaded_files:
                         col_chart, col_table = st.columns([1, 1])
                         
                         with col_chart:
-                            fig_pie = px.pie(pie_df, values='Market Value', names='Asset', title='Portfolio Allocation (Market Value)')
+                            fig_pie = _pie_fig(pie_df)
                             st.plotly_chart(fig_pie, use_container_width=True)
                             
                         with col_table:
                             # INCREASED PRECISION
-                            format_dict = {
-                                'Quantity': '{:,.8f}', 
-                                'Unit Price': '${:,.2f}',
-                                'Market Value': '${:,.2f}',
-                                'Cost Basis': '${:,.2f}',
-                                'Avg Buy Price': '${:,.2f}',
-                                'Unrealized Gain': '${:,.2f}'
-                            }
-                            st.dataframe(holdings_df.style.format(format_dict))
+                            # Formatting shipped as column metadata (no Styler materialization); the
+                            # predefined formats keep the thousands separators, step fixes the decimals
+                            st.dataframe(
+                                holdings_df,
+                                column_config={
+                                    "Quantity": st.column_config.NumberColumn("Quantity", format="localized", step=1e-8),
+                                    "Unit Price": st.column_config.NumberColumn("Unit Price", format="dollar"),
+                                    "Market Value": st.column_config.NumberColumn("Market Value", format="dollar"),
+                                    "Cost Basis": st.column_config.NumberColumn("Cost Basis", format="dollar"),
+                                    "Avg Buy Price": st.column_config.NumberColumn("Avg Buy Price", format="dollar"),
+                                    "Unrealized Gain": st.column_config.NumberColumn("Unrealized Gain", format="dollar")
+                                }
+                            )
                     else:
                         st.info("No current holdings found.")
 
                 with tab3:
-                    st.subheader("Asset Explorer")
-                    available_assets = [c.replace('_qty', '') for c in daily_df.columns if c.endswith('_qty')]
-                    if available_assets:
-                        # Default index: try to respect filter logic if possible, or just default to first
-                        default_idx = 0
-                        
-                        selected_asset = st.selectbox("Select Asset to View Details", available_assets, index=default_idx)
-                        
-                        st.markdown(f"### {selected_asset} Performance")
-                        
-                        # --- Per-Asset Metrics (Moved from Top) ---
-                        if not holdings_df.empty:
-                             row = holdings_df[holdings_df['Asset'] == selected_asset]
-                             if not row.empty:
-                                 asset_row = row.iloc[0]
-                                 m1, m2, m3 = st.columns(3)
-                                 m1.metric("Quantity Held", f"{asset_row['Quantity']:,.8f} {selected_asset}")
-                                 m2.metric("Avg Buy Price", f"${asset_row['Avg Buy Price']:,.2f}")
-                                 m3.metric("Current Price", f"${asset_row['Unit Price']:,.2f}")
-                             else:
-                                 st.info(f"No current holdings of {selected_asset} (Sold out or Historic only).")
-                        
-                        st.divider()
-                        
-                        cb_col = f"{selected_asset}_cb"
-                        mv_col = f"{selected_asset}_mv"
-                        
-                        if cb_col in daily_df.columns and mv_col in daily_df.columns:
-                            fig_asset = go.Figure()
-                            fig_asset.add_trace(go.Scatter(x=daily_df.index, y=daily_df[cb_col], mode='lines', name='Cost Basis'))
-                            fig_asset.add_trace(go.Scatter(x=daily_df.index, y=daily_df[mv_col], mode='lines', name='Market Value'))
-                            fig_asset.update_layout(title=f"{selected_asset} - Cost Basis vs Market Value", hovermode="x unified")
-                            st.plotly_chart(fig_asset, use_container_width=True)
-                        else:
-                            st.warning(f"No detailed history found for {selected_asset}")
-                    else:
-                        st.info("No assets found in history.")
+                    _render_tab3(daily_df, holdings_df, available_assets)
 
                 with tab4:
-                    st.subheader("Realized Gains Log")
-                    all_assets = realized_gains_df['asset'].unique().tolist() if not realized_gains_df.empty else []
-                    
-                    selected_assets = st.multiselect("Filter by Asset", all_assets, default=all_assets)
-                    
-                    if not realized_gains_df.empty:
-                        filtered_gains = realized_gains_df[realized_gains_df['asset'].isin(selected_assets)]
-                        display_cols = ['date', 'asset', 'quantity', 'proceeds', 'cost_basis', 'gain_usd', 'tx_type']
-                        display_df = filtered_gains[[c for c in display_cols if c in filtered_gains.columns]]
-                        
-                        # INCREASED PRECISION
-                        st.dataframe(display_df.style.format({
-                            "quantity": "{:,.8f}",
-                            "proceeds": "${:,.2f}",
-                            "cost_basis": "${:,.2f}",
-                            "gain_usd": "${:,.2f}"
-                        }))
-                        
-                        if not filtered_gains.empty:
-                            total_selected_gain = filtered_gains['gain_usd'].sum()
-                            st.metric(f"Realized Gain ({', '.join(selected_assets) if len(selected_assets) < 5 else 'Selected'})", f"${total_selected_gain:,.2f}")
-                    else:
-                        st.info("No realized gains yet.")
+                    _render_tab4(realized_gains_df, realized_assets)
 
                 with tab5:
-                    st.subheader("Transaction History")
-                    
-                    # Convert list of transactions objects to DataFrame
-                    if transactions:
-                        tx_data = []
-                        for t in transactions:
-                            # LINK LOGIC
-                            # Validate if txid is a valid hex hash for Blockchain (64 chars, hex)
-                            # If not, try refid? (Often Kraken refid is the real blockchain hash for deposits/withdrawals)
-                            
-                            explorer_url = None
-                            
-                            if t.asset == 'BTC':
-                                target_hash = None
-                                
-                                # Try txid first
-                                if is_valid_hex_tx(t.txid):
-                                    target_hash = t.txid
-                                # Try refid second
-                                elif is_valid_hex_tx(t.refid):
-                                    target_hash = t.refid
-                                
-                                if target_hash:
-                                    explorer_url = f"https://mempool.space/tx/{target_hash}"
-                                
-                            tx_data.append({
-                                'Date': t.timestamp,
-                                'Type': t.type,
-                                'Asset': t.asset,
-                                'Amount': float(t.amount),
-                                'Fee': float(t.fee),
-                                'Fiat Value': float(t.fiat_value) if t.fiat_value is not None else 0.0,
-                                'TxID': t.txid,
-                                'RefID': t.refid,
-                                'Explorer': explorer_url
-                            })
-                        
-                        tx_df = pd.DataFrame(tx_data)
-                        
-                        # Display with Column Config for Links
-                        st.dataframe(
-                            tx_df,
-                            column_config={
-                                "Explorer": st.column_config.LinkColumn("Explorer", display_text="Mempool.space"),
-                                "Amount": st.column_config.NumberColumn("Amount", format="%.8f"),
-                                "Fee": st.column_config.NumberColumn("Fee", format="%.8f"),
-                                "Fiat Value": st.column_config.NumberColumn("Fiat Value", format="$%.2f"),
-                                "Date": st.column_config.DatetimeColumn("Date", format="D MMM YYYY, HH:mm")
-                            },
-                            column_order=['Date', 'Type', 'Asset', 'Amount', 'Fee', 'Fiat Value', 'Explorer', 'TxID', 'RefID'],
-                            use_container_width=True
-                        )
-                        
-                        st.caption(f"Showing {len(tx_df)} transactions.")
-                    else:
-                        st.info("No transactions to display.")
+                    _render_tab5(transactions)
 
             except Exception as e:
                 st.error(f"Error processing data: {e}")
@@ -4,11 +4,40 @@ from typing import Dict, List
 from .prices import get_historical_prices
 import streamlit as st
 
-def calculate_portfolio_performance(history_df: pd.DataFrame) -> pd.DataFrame:
+try:
+    import polars as pl
+except ImportError:  # Polars is optional; the pandas path is used instead
+    pl = None
+
+def _resample_daily_polars(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Polars equivalent of frame.resample('D').last().ffill().fillna(0), run as one
+    lazy query. Returns a pandas frame at the boundary.
+    """
+    index_name = frame.index.name
+    daily = (
+        pl.from_pandas(frame.reset_index())
+        .lazy()
+        .sort(index_name)
+        .group_by_dynamic(index_name, every='1d')
+        .agg(pl.all().last())
+        .collect()
+        # group_by_dynamic only emits days with data; add the empty days back
+        .upsample(time_column=index_name, every='1d')
+        .fill_null(strategy='forward')
+        .fill_null(0)
+    )
+    out = daily.to_pandas().set_index(index_name)
+    # Keep the input's resolution (pandas 3 infers 'us', older pandas 'ns')
+    out.index = pd.DatetimeIndex(out.index).as_unit(frame.index.unit)
+    return out
+
+def calculate_portfolio_performance(history_df: pd.DataFrame, use_polars: bool = False) -> pd.DataFrame:
     """
     Combines manual transaction history with external price feeds to create
     an accurate 'Market Value' chart over time.
     Calculates metrics for BOTH the efficient Total Portfolio and Individual Assets.
+    If use_polars is set (and polars is installed), the daily resampling runs in Polars.
     """
     if history_df.empty:
         return pd.DataFrame()
@@ -21,33 +50,42 @@ def calculate_portfolio_performance(history_df: pd.DataFrame) -> pd.DataFrame:
     details_list = df['asset_details'].tolist()
     
     # We want to create time-series for Qty and CostBasis per asset
-    # normalize structure:
-    # We will create a list of flattened dicts per row: {'BTC_qty': 1, 'BTC_cb': 100, ...}
-    flattened_rows = []
+    # Fill one float64 block directly: columns are [<asset>_qty..., <asset>_cb...].
+    # Assets absent from a snapshot (sold out) are 0, not missing.
+    detail_assets = sorted({asset for item in details_list for asset in item})
+    col_idx = {asset: i for i, asset in enumerate(detail_assets)}
+    n_assets = len(detail_assets)
     
-    for item in details_list:
-        row = {}
+    arr = np.zeros((len(details_list), 2 * n_assets), dtype=np.float64)
+    for i, item in enumerate(details_list):
         for asset, data in item.items():
-            row[f"{asset}_qty"] = data['qty']
-            row[f"{asset}_cb"] = data['cost_basis']
-        flattened_rows.append(row)
-        
-    details_df = pd.DataFrame(flattened_rows, index=df.index)
-    details_df = details_df.astype(float)
+            j = col_idx[asset]
+            arr[i, j] = data['qty']
+            arr[i, n_assets + j] = data['cost_basis']
+    
+    details_df = pd.DataFrame(
+        arr,
+        index=df.index,
+        columns=[f"{a}_qty" for a in detail_assets] + [f"{a}_cb" for a in detail_assets]
+    )
     
     # Resample everything to Daily
     # Combine with Totals
-    daily_totals = df[['total_realized_gain', 'total_cost_basis', 'total_market_value']].resample('D').last().ffill()
-    
-    # Resample details (forward fill holding state)
-    daily_details = details_df.resample('D').last().ffill().fillna(0)
-    
-    # Merge
-    daily_df = pd.concat([daily_totals, daily_details], axis=1)
+    totals_df = df[['total_realized_gain', 'total_cost_basis', 'total_market_value']]
+    if use_polars and pl is not None:
+        daily_df = _resample_daily_polars(pd.concat([totals_df, details_df], axis=1))
+    else:
+        daily_totals = totals_df.resample('D').last().ffill()
+        
+        # Resample details (forward fill holding state)
+        daily_details = details_df.resample('D').last().ffill().fillna(0)
+        
+        # Merge
+        daily_df = pd.concat([daily_totals, daily_details], axis=1)
     
     # --- 2. Get External Prices ---
     # Extract asset names from columns (ending in _qty)
-    assets = [c.replace('_qty', '') for c in daily_details.columns if c.endswith('_qty')]
+    assets = [c.replace('_qty', '') for c in details_df.columns if c.endswith('_qty')]
     
     if daily_df.index.tz is not None:
         daily_df.index = daily_df.index.tz_localize(None)
@@ -66,37 +104,30 @@ def calculate_portfolio_performance(history_df: pd.DataFrame) -> pd.DataFrame:
         if price_df.index.tz is not None:
              price_df.index = price_df.index.tz_localize(None)
         
-        # Align
-        combined_index = daily_df.index.union(price_df.index)
-        daily_df = daily_df.reindex(combined_index).ffill().fillna(0)
-        price_df = price_df.reindex(combined_index).ffill()
+        # Align: one outer join on the date index + one ffill, rather than two reindex passes.
+        # (Outer, not merge_asof: price days after the last transaction carry today's valuation.)
+        aligned = pd.concat({'daily': daily_df, 'price': price_df}, axis=1).ffill()
+        combined_index = aligned.index
+        daily_df = aligned['daily'].fillna(0)
+        price_df = aligned['price']
     else:
         combined_index = daily_df.index
     
     # --- 3. Calculate Market Values ---
-    total_calculated_value = pd.Series(0.0, index=combined_index)
-    has_external_data = False
+    # Market Value = Qty * External Price, for all assets in one frame-level multiply.
+    # Assets without an external price get MV 0 (no per-asset engine MV estimate for history).
+    has_external_data = not price_df.empty and any(a in price_df.columns for a in assets)
     
-    for asset in assets:
-        qty_col = f"{asset}_qty"
-        cb_col = f"{asset}_cb"
-        mv_col = f"{asset}_mv"
-        
-        # Default MV to 0
-        mv_series = pd.Series(0.0, index=combined_index)
-        
-        if not price_df.empty and asset in price_df.columns:
-            # Calc Market Value = Qty * External Price
-            mv_series = daily_df[qty_col] * price_df[asset]
-            has_external_data = True
-        else:
-            # Fallback? We don't have per-asset engine MV estimate easily available for history 
-            # (unless we calculated it in engine).
-            # We can't do much. MV is 0.
-            pass
-            
-        daily_df[mv_col] = mv_series.fillna(0)
-        total_calculated_value = total_calculated_value + daily_df[mv_col]
+    # Both operands are already on combined_index in `assets` order, so multiply the raw
+    # ndarrays (no label alignment) and wrap the result as a single block.
+    qty = daily_df[[f"{a}_qty" for a in assets]].to_numpy(dtype=np.float64)
+    prices = price_df.reindex(index=combined_index, columns=assets).to_numpy(dtype=np.float64)
+    mv = qty * prices
+    mv[np.isnan(mv)] = 0.0
+    mv_df = pd.DataFrame(mv, index=daily_df.index, columns=[f"{a}_mv" for a in assets])
+    
+    total_calculated_value = mv_df.sum(axis=1)
+    daily_df = pd.concat([daily_df, mv_df], axis=1)
 
     # --- 4. Final Totals Logic ---
     # If we have valid external data, overwrite the Engine's total estimates
@@ -106,4 +137,5 @@ def calculate_portfolio_performance(history_df: pd.DataFrame) -> pd.DataFrame:
         # Keep Engine's 'total_market_value' which was resampled
         pass
 
-    return daily_df.astype(float)
+    # Every column is float64 by construction (engine emits floats), so no final cast/copy
+    return daily_df
@@ -1,32 +1,141 @@
+import math
 import pandas as pd
-from typing import List, Dict, Deque
-from collections import deque
-from decimal import Decimal
-from .models import Transaction
+import numpy as np
+from operator import attrgetter
+from typing import List, Dict, Tuple
+from .models import Transaction, TX_TYPE_CODES
+from .engine_jit import fifo_consume
+
+# Row layouts of FIFOEngine.realized_gains / portfolio_history (stored as tuples)
+REALIZED_GAINS_COLUMNS = ['date', 'asset', 'quantity', 'proceeds', 'cost_basis', 'gain_usd', 'tx_type']
+HISTORY_COLUMNS = ['timestamp', 'total_realized_gain', 'total_cost_basis', 'total_market_value', 'asset_details']
+
+def _type_mask(*types: str) -> int:
+    mask = 0
+    for t in types:
+        mask |= 1 << TX_TYPE_CODES[t]
+    return mask
+
+# Incoming movements that are returns of already-held assets (deposits_as_transfers)
+_DEPOSIT_TRANSFER_MASK = _type_mask('deposit', 'transfer', 'receive')
+# Outgoing movements that are self-transfers (withdrawals_as_transfers)
+_WITHDRAWAL_TRANSFER_MASK = _type_mask('withdrawal', 'transfer', 'send')
+
+class LotBook:
+    """
+    FIFO lot storage for one asset, as parallel arrays (struct-of-arrays).
+    Live lots are [head:tail]: qty and unit cost (USD).
+    """
+    __slots__ = ('qty', 'cost', 'head', 'tail', 'cap')
+
+    def __init__(self, cap: int = 64):
+        self.qty = np.empty(cap, dtype=np.float64)
+        self.cost = np.empty(cap, dtype=np.float64)
+        self.head = 0
+        self.tail = 0
+        self.cap = cap
+
+    def __len__(self) -> int:
+        return self.tail - self.head
+
+    def append(self, qty: float, unit_cost: float):
+        if self.tail == self.cap:
+            self._grow()
+        self.qty[self.tail] = qty
+        self.cost[self.tail] = unit_cost
+        self.tail += 1
+
+    def consume(self, qty_to_sell: float) -> float:
+        """
+        FIFO-consumes up to qty_to_sell and returns the consumed cost basis.
+        """
+        total_cost, self.head = fifo_consume(self.qty, self.cost, self.head, self.tail, qty_to_sell)
+        return total_cost
+
+    def _grow(self):
+        live = self.tail - self.head
+        if self.head >= self.cap // 2:
+            # Mostly consumed: compact live lots to the front instead of growing
+            new_cap = self.cap
+        else:
+            # Amortized doubling
+            new_cap = self.cap * 2
+        for name in ('qty', 'cost'):
+            old = getattr(self, name)
+            new = np.empty(new_cap, dtype=old.dtype)
+            new[:live] = old[self.head:self.tail]
+            setattr(self, name, new)
+        self.head = 0
+        self.tail = live
+        self.cap = new_cap
 
 class FIFOEngine:
     def __init__(self, transactions: List[Transaction], withdrawals_as_transfers: bool = True, deposits_as_transfers: bool = False):
-        self.transactions = sorted(transactions, key=lambda x: x.timestamp)
+        # Loader output is already time-ordered, which makes this a linear pass;
+        # still sorted here for callers that don't guarantee it.
+        self.transactions = sorted(transactions, key=attrgetter('timestamp'))
         self.withdrawals_as_transfers = withdrawals_as_transfers
         self.deposits_as_transfers = deposits_as_transfers
-        self.inventory: Dict[str, Deque] = {} # Asset -> Deque of (quantity, cost_per_unit_usd)
-        self.last_known_prices: Dict[str, Decimal] = {} # Asset -> Price
-        self.realized_gains: List[Dict] = []
-        self.portfolio_history: List[Dict] = [] # Snapshots over time
+        self.inventory: Dict[str, LotBook] = {} # Asset -> FIFO lots
+        self._asset_qty: Dict[str, float] = {} # Asset -> running quantity held
+        self._asset_cost: Dict[str, float] = {} # Asset -> running cost basis held
+        self.last_known_prices: Dict[str, float] = {} # Asset -> Price
+        self.realized_gains: List[Tuple] = [] # Rows in REALIZED_GAINS_COLUMNS order
+        self.portfolio_history: List[Tuple] = [] # Snapshots over time, rows in HISTORY_COLUMNS order
 
     def run(self):
         """
         Process all transactions and return dataframes for analysis.
+        Amounts are processed as float64; running per-asset totals are kept
+        incrementally so snapshots don't rescan every lot (non-finite inputs are
+        neutralized before they reach them).
         """
-        current_balances: Dict[str, Decimal] = {}
+        current_balances: Dict[str, float] = {}
         # Reset internal state if running multiple times? 
         # Actually init resets state. run() should probably be called once.
         self.last_known_prices = {}
-        cumulative_realized_gain = Decimal(0)
+        cumulative_realized_gain = 0.0
+        
+        # Running portfolio totals (crypto only; USD cash is added at snapshot time)
+        total_cost_crypto = 0.0
+        total_market_value_crypto = 0.0
+        # Current per-asset state. Copied into a snapshot only if it changed since
+        # the last one, so snapshots of unchanged state share the same dict.
+        asset_details: Dict[str, Dict[str, float]] = {}
+        snapshot_details: Dict[str, Dict[str, float]] = {}
+        details_changed = False
+        
+        # Snapshots are only consumed at daily granularity downstream, so emit one
+        # per day (the state after that day's last tx) instead of one per tx.
+        prev_date = None
+        prev_ts = None
+        total_cost_basis_held = 0.0
+        total_market_value_est = 0.0
         
         for tx in self.transactions:
+            tx_date = tx.timestamp.date()
+            if prev_date is not None and tx_date != prev_date:
+                if details_changed:
+                    snapshot_details = dict(asset_details)
+                    details_changed = False
+                self._append_snapshot(prev_ts, cumulative_realized_gain, total_cost_basis_held, total_market_value_est, snapshot_details)
+            prev_date = tx_date
+            prev_ts = tx.timestamp
+            
             asset = tx.asset
-            amount = tx.amount
+            amount = float(tx.amount)
+            fiat_value = float(tx.fiat_value) if tx.fiat_value is not None else None
+            # Running totals are updated by delta, so a single NaN/inf would stick
+            # forever: treat a non-finite amount as a no-op, a non-finite fiat value as missing
+            if not math.isfinite(amount):
+                amount = 0.0
+            if fiat_value is not None and not math.isfinite(fiat_value):
+                fiat_value = None
+            type_bit = 1 << tx.type_code
+            
+            prev_qty = self._asset_qty.get(asset, 0.0)
+            prev_cost = self._asset_cost.get(asset, 0.0)
+            prev_price = self.last_known_prices.get(asset, 0.0)
             
             # Skip fiat currency itself (e.g. ZUSD, USD) if we consider it the baseline
             # Assuming 'ZUSD', 'USD' are fiat. 
@@ -35,35 +144,33 @@ class FIFOEngine:
             
             # If fiat, we just update balance, no cost basis logic needed (tracking CASH basis is separate)
             if is_fiat:
-                current_balances[asset] = current_balances.get(asset, Decimal(0)) + amount
+                current_balances[asset] = current_balances.get(asset, 0.0) + amount
             else:
                 # Crypto Asset
                 if amount > 0:
                     # BUY / DEPOSIT / RECEIVE
                     # Cost Basis: inferred from fiat_value or external price.
                     # If fiat_value is present, cost_basis = fiat_value
-                    cost_basis_total = tx.fiat_value if tx.fiat_value is not None else Decimal(0)
-                    cost_per_unit = cost_basis_total / amount if amount != 0 else Decimal(0)
+                    cost_basis_total = fiat_value if fiat_value is not None else 0.0
+                    cost_per_unit = cost_basis_total / amount if amount != 0 else 0.0
                     
                     # Double Counting Prevention:
                     # If this is a Deposit (not a Buy) and deposits_as_transfers is True,
                     # We assume this is a "Return" of assets we already hold (from a withdrawal).
                     # So we SKIP adding it.
                     is_deposit_transfer = False
-                    if self.deposits_as_transfers and tx.type.lower() in ['deposit', 'transfer', 'receive']:
+                    if self.deposits_as_transfers and _DEPOSIT_TRANSFER_MASK & type_bit:
                          is_deposit_transfer = True
                     
                     if not is_deposit_transfer:
                         if asset not in self.inventory:
-                            self.inventory[asset] = deque()
+                            self.inventory[asset] = LotBook()
                         
-                        self.inventory[asset].append({
-                            'qty': amount,
-                            'unit_cost': cost_per_unit,
-                            'date': tx.timestamp
-                        })
+                        self.inventory[asset].append(amount, cost_per_unit)
+                        self._asset_qty[asset] = self._asset_qty.get(asset, 0.0) + amount
+                        self._asset_cost[asset] = self._asset_cost.get(asset, 0.0) + amount * cost_per_unit
                         
-                        current_balances[asset] = current_balances.get(asset, Decimal(0)) + amount
+                        current_balances[asset] = current_balances.get(asset, 0.0) + amount
                     else:
                         # It is a return. We assume we already have the inventory.
                         pass
@@ -75,7 +182,7 @@ class FIFOEngine:
                 elif amount < 0:
                     # SELL / WITHDRAWAL / SEND
                     qty_to_sell = abs(amount)
-                    proceeds_total = tx.fiat_value if tx.fiat_value is not None else Decimal(0)
+                    proceeds_total = fiat_value if fiat_value is not None else 0.0
                     # Note: If fiat_value is usually positive in CSV for value? Or negative?
                     # Assuming fiat_value is the positive USD equivalent.
                     # If parsed as negative (because amount is negative), take abs.
@@ -88,144 +195,121 @@ class FIFOEngine:
                     # Determine nature of transaction
                     is_transfer = False
                     if self.withdrawals_as_transfers:
-                        # Only consider it a transfer if it is explicitly a movement type
-                        # AND NOT a trade/margin/spend (unless spend is send? Spend is usually card)
-                        type_lower = tx.type.lower()
-                        if type_lower in ['withdrawal', 'transfer', 'send', 'deposit']: 
-                            # Deposit is usually positive, but if negative? 
-                            is_transfer = True
-                        
-                        # Explicitly ensure trades/spends are NOT transfers
-                        # Some conversions might show up as 'trade' with negative amount
-                        # 'spend' is a taxable event (goods/services), not a self-transfer
-                        if type_lower in ['trade', 'margin', 'settled', 'spend']:
-                            is_transfer = False
+                        # Only consider it a transfer if it is explicitly a movement type.
+                        # Trades/spends are never in the mask: some conversions show up as 'trade'
+                        # with negative amount, and 'spend' is a taxable event (goods/services), not a self-transfer
+                        is_transfer = bool(_WITHDRAWAL_TRANSFER_MASK & type_bit)
                     
                     # If it's a transfer (self-transfer to cold wallet), we do NOT sell.
                     # We keep the assets in inventory (Portfolio View).
                     if is_transfer:
-                        # Update implicit price if we can derive it?
-                        # Often transfers have fee but no value. 
-                        # If meaningful logic needed here, insert it.
-                        # For now, we simple SKIP the "sell" logic.
-                        # We still update current_balances (fiat/raw tracking) if we want?
-                        # Actually current_balances is just for fiat in this code.
-                        pass 
+                        # SKIP the "sell" logic.
+                        pass
                     else:
                         # It is a SALE. Consume inventory.
-                        total_cost_basis = Decimal(0)
+                        total_cost_basis = 0.0
                         if asset in self.inventory:
-                            queue = self.inventory[asset]
+                            lots = self.inventory[asset]
+                            total_cost_basis = lots.consume(qty_to_sell)
                             
-                            while qty_to_sell > 0 and queue:
-                                lot = queue[0]
-                                lot_qty = lot['qty']
-                                lot_price = lot['unit_cost']
-                                
-                                if lot_qty <= qty_to_sell:
-                                    # Consume entire lot
-                                    total_cost_basis += lot_qty * lot_price
-                                    qty_to_sell -= lot_qty
-                                    queue.popleft()
-                                else:
-                                    # Partial lot consumption
-                                    total_cost_basis += qty_to_sell * lot_price
-                                    lot['qty'] -= qty_to_sell
-                                    qty_to_sell = Decimal(0)
+                            if not lots:
+                                # Sold out: reset exactly rather than carry float dust
+                                self._asset_qty[asset] = 0.0
+                                self._asset_cost[asset] = 0.0
+                            else:
+                                self._asset_qty[asset] -= qty_to_sell
+                                self._asset_cost[asset] -= total_cost_basis
                         
                         gain = proceeds_total - total_cost_basis
                         cumulative_realized_gain += gain
                         
-                        self.realized_gains.append({
-                            'date': tx.timestamp,
-                            'asset': asset,
-                            'quantity': abs(amount),
-                            'proceeds': proceeds_total,
-                            'cost_basis': total_cost_basis,
-                            'gain_usd': gain,
-                            'tx_type': tx.type
-                        })
+                        self.realized_gains.append((
+                            tx.timestamp,
+                            asset,
+                            abs(amount),
+                            proceeds_total,
+                            total_cost_basis,
+                            gain,
+                            tx.type
+                        ))
                     
-                    self.realized_gains.append({
-                        'date': tx.timestamp,
-                        'asset': asset,
-                        'gain_usd': gain
-                    })
-                    
-                    current_balances[asset] = current_balances.get(asset, Decimal(0)) + amount
+                    current_balances[asset] = current_balances.get(asset, 0.0) + amount
 
             # Calculate Portfolio Metrics
-            total_cost_basis_held = Decimal(0)
-            total_market_value_est = Decimal(0)
-            
-            # Sum up inventory for cost basis
-            for ast, queue in self.inventory.items():
-                asset_qty = Decimal(0)
-                asset_cost = Decimal(0)
-                for lot in queue:
-                    asset_qty += lot['qty']
-                    asset_cost += lot['qty'] * lot['unit_cost']
-                
-                total_cost_basis_held += asset_cost
+            # Only this tx's asset can have changed, so apply its delta to the running totals
+            if not is_fiat:
+                asset_qty = self._asset_qty.get(asset, 0.0)
+                asset_cost = self._asset_cost.get(asset, 0.0)
                 
                 # Estimate market value
                 # Use current price if available, else use cost? Or last known.
                 # If we have a last known price, use it.
-                price = self.last_known_prices.get(ast, Decimal(0))
-                total_market_value_est += asset_qty * price
-
+                price = self.last_known_prices.get(asset, 0.0)
+                
+                total_cost_crypto += asset_cost - prev_cost
+                total_market_value_crypto += asset_qty * price - prev_qty * prev_price
+                
+                if asset_qty != prev_qty or asset_cost != prev_cost:
+                    details_changed = True
+                    lots = self.inventory.get(asset)
+                    if lots:
+                        asset_details[asset] = {'qty': asset_qty, 'cost_basis': asset_cost}
+                    else:
+                        asset_details.pop(asset, None)
+            
             # Add Fiat balances to Market Value (1:1 for USD)
-            for fiat_currency, bal in current_balances.items():
-                if fiat_currency in ['ZUSD', 'USD']:
-                     total_cost_basis_held += bal # Cash is its own basis
-                     total_market_value_est += bal
-                # Handle others if needed
-
-            self.portfolio_history.append({
-                'timestamp': tx.timestamp,
-                'total_realized_gain': cumulative_realized_gain,
-                'total_cost_basis': total_cost_basis_held,
-                'total_market_value': total_market_value_est,
-                # Snapshot detailed asset state
-                'asset_details': {
-                    ast: {
-                        'qty': sum(lot['qty'] for lot in self.inventory[ast]),
-                        'cost_basis': sum(lot['qty'] * lot['unit_cost'] for lot in self.inventory[ast])
-                    }
-                    for ast in self.inventory if self.inventory[ast]
-                }
-            })
+            cash = current_balances.get('ZUSD', 0.0) + current_balances.get('USD', 0.0) # Cash is its own basis
+            total_cost_basis_held = total_cost_crypto + cash
+            total_market_value_est = total_market_value_crypto + cash
+        
+        # Final day
+        if prev_ts is not None:
+            if details_changed:
+                snapshot_details = dict(asset_details)
+            self._append_snapshot(prev_ts, cumulative_realized_gain, total_cost_basis_held, total_market_value_est, snapshot_details)
+    
+    def _append_snapshot(self, timestamp, total_realized_gain, total_cost_basis, total_market_value, asset_details):
+        self.portfolio_history.append((
+            timestamp,
+            total_realized_gain,
+            total_cost_basis,
+            total_market_value,
+            # Snapshot detailed asset state (shared with neighbouring snapshots, treat as read-only)
+            asset_details
+        ))
             
     def get_realized_gains_df(self):
-        return pd.DataFrame(self.realized_gains)
+        return pd.DataFrame.from_records(self.realized_gains, columns=REALIZED_GAINS_COLUMNS)
     
     def get_history_df(self):
-        return pd.DataFrame(self.portfolio_history)
+        return pd.DataFrame.from_records(self.portfolio_history, columns=HISTORY_COLUMNS)
 
     def get_holdings_summary(self) -> pd.DataFrame:
         """
         Returns a DataFrame summarizing current holdings per asset.
         Columns: Asset, Quantity, UnitPrice, MarketValue, TotalCostBasis, UnrealizedGain
         """
-        data = []
-        for asset, queue in self.inventory.items():
-            qty = sum(lot['qty'] for lot in queue)
-            if qty > 0: # Only show positive holdings
-                cost_basis = sum(lot['qty'] * lot['unit_cost'] for lot in queue)
-                price = self.last_known_prices.get(asset, Decimal(0))
-                market_value = qty * price
-                
-                data.append({
-                    'Asset': asset,
-                    'Quantity': float(qty),
-                    'Unit Price': float(price),
-                    'Market Value': float(market_value),
-                    'Cost Basis': float(cost_basis),
-                    'Avg Buy Price': float(cost_basis / qty) if qty > 0 else 0.0,
-                    'Unrealized Gain': float(market_value - cost_basis)
-                })
+        # Read the running per-asset totals straight into arrays
+        assets = list(self.inventory)
+        qty = np.fromiter((self._asset_qty[a] for a in assets), dtype=np.float64, count=len(assets))
+        cost_basis = np.fromiter((self._asset_cost[a] for a in assets), dtype=np.float64, count=len(assets))
+        price = np.fromiter((self.last_known_prices.get(a, 0.0) for a in assets), dtype=np.float64, count=len(assets))
+        
+        # Only show positive holdings
+        held = qty > 0
+        assets = np.array(assets, dtype=object)[held]
+        qty, cost_basis, price = qty[held], cost_basis[held], price[held]
+        market_value = qty * price
         
         # Also include fiat balances if any? (Not tracked in inventory, need to track separate balance dict if we want that)
         # Ignoring fiat for "Holdings" usually implies Crypto Holdings.
         
-        return pd.DataFrame(data)
+        return pd.DataFrame({
+            'Asset': assets,
+            'Quantity': qty,
+            'Unit Price': price,
+            'Market Value': market_value,
+            'Cost Basis': cost_basis,
+            'Avg Buy Price': cost_basis / qty,
+            'Unrealized Gain': market_value - cost_basis
+        })
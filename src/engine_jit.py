@@ -0,0 +1,35 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; fall back to the plain Python loop
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# Quantities below this are treated as fully consumed (float rounding dust)
+QTY_EPS = 1e-12
+
+@njit(cache=True)
+def fifo_consume(qty: np.ndarray, cost: np.ndarray, head: int, n: int, want: float):
+    """
+    FIFO-consumes up to `want` units from lots qty[head:n] (unit cost in cost[head:n]).
+    Partially consumed lots are reduced in place.
+    Returns (consumed cost basis, new head).
+    """
+    total_cb = 0.0
+    while want > 0 and head < n:
+        lq = qty[head]
+        lc = cost[head]
+        if lq <= want + QTY_EPS:
+            # Consume entire lot
+            total_cb += lq * lc
+            want -= lq
+            head += 1
+        else:
+            # Partial lot consumption
+            total_cb += want * lc
+            qty[head] = lq - want
+            want = 0.0
+    return total_cb, head
@@ -2,7 +2,27 @@ import pandas as pd
 from typing import List
 from datetime import datetime
 from decimal import Decimal
-from .models import Transaction
+from .models import Transaction, TX_TYPE_CODES, TX_TYPE_OTHER
+
+# Common mappings: Kraken asset code -> standard symbol
+_ASSET_MAP = {
+    'XXBT': 'BTC',
+    'XBT': 'BTC',
+    'XETH': 'ETH',
+    'XXRP': 'XRP',
+    'XXLM': 'XLM',
+    'XLTC': 'LTC',
+    'XETC': 'ETC',
+    'XZEC': 'ZEC',
+    'XREP': 'REP',
+    'XXMR': 'XMR',
+    'ZUSD': 'USD',
+    'ZEUR': 'EUR',
+    'ZGBP': 'GBP',
+    'ZCAD': 'CAD',
+    'ZJPY': 'JPY',
+    'ZKRW': 'KRW'
+}
 
 def clean_asset_code(asset: str) -> str:
     """
@@ -11,27 +31,7 @@ def clean_asset_code(asset: str) -> str:
     if not asset:
         return asset
     
-    # Common mappings
-    mapping = {
-        'XXBT': 'BTC',
-        'XBT': 'BTC',
-        'XETH': 'ETH',
-        'XXRP': 'XRP',
-        'XXLM': 'XLM',
-        'XLTC': 'LTC',
-        'XETC': 'ETC',
-        'XZEC': 'ZEC',
-        'XREP': 'REP',
-        'XXMR': 'XMR',
-        'ZUSD': 'USD',
-        'ZEUR': 'EUR',
-        'ZGBP': 'GBP',
-        'ZCAD': 'CAD',
-        'ZJPY': 'JPY',
-        'ZKRW': 'KRW'
-    }
-    
-    return mapping.get(asset, asset)
+    return _ASSET_MAP.get(asset, asset)
 
 def parse_kraken_ledger(df: pd.DataFrame) -> List[Transaction]:
     """
@@ -44,56 +44,132 @@ def parse_kraken_ledger(df: pd.DataFrame) -> List[Transaction]:
     required_columns = ["txid", "refid", "time", "type", "subtype", "aclass", "asset", "amount", "fee", "balance"]
     # check for existence (ignoring case for robustness if needed, but assuming strict for now based on user prompt)
     
-    for _, row in df.iterrows():
-        # Parse timestamp. Kraken usually uses "YYYY-MM-DD HH:MM:SS"
-        # We'll use pd.to_datetime logic if the df wasn't already parsed, but let's assume raw strings for safety or convert in the loop
-        # Actually better to let pandas parse dates on load, but we handle it here just in case.
-        
-        try:
-            ts = pd.to_datetime(row['time']).to_pydatetime()
-        except Exception:
-            # Fallback or error? defaulting to now or skipping? 
-            # In a strict financial app, we should probably fail, but let's try to be robust.
-            ts = datetime.utcnow() # Placeholder, ideally log error
-
+    if df.empty:
+        return transactions
+    
+    # Column-wise preparation (one pass per column instead of per-row Series access)
+    # Parse timestamp. Kraken usually uses "YYYY-MM-DD HH:MM:SS"
+    # Unparseable times fall back to now (Placeholder, ideally log error)
+    times = pd.to_datetime(df['time'], errors='coerce')
+    
+    # Emit transactions in time order (stable, so same-time rows keep file order)
+    # so downstream sorting is already a no-op pass.
+    order = times.reset_index(drop=True).sort_values(kind='mergesort', na_position='last').index
+    df = df.iloc[order]
+    times = times.iloc[order]
+    fallback_ts = datetime.utcnow()
+    timestamps = [fallback_ts if pd.isna(t) else t.to_pydatetime() for t in times]
+    
+    def _optional_str(col: str) -> list:
+        # Missing/empty cells -> None. Built as a list: on newer pandas the str
+        # dtype turns .where(..., None) back into NaN.
+        values = df[col].astype(str).tolist()
+        present = (df[col].notna() & (df[col].astype(str) != '')).tolist()
+        return [v if p else None for v, p in zip(values, present)]
+    
+    amounts = df['amount'].astype(str).to_numpy()
+    fees = df['fee'].astype(str).to_numpy()
+    balances = _optional_str('balance')
+    if 'amountusd' in df.columns:
+        fiats = _optional_str('amountusd')
+    else:
+        fiats = [None] * len(df)
+    
+    def _text(col: str) -> pd.Series:
+        # Missing cells -> ''. On newer pandas astype(str) alone leaves them as float NaN.
+        return df[col].astype(object).fillna('').astype(str)
+    
+    txids = _text('txid').tolist()
+    refids = _text('refid').tolist()
+    raw_types = _text('type')
+    types = raw_types.tolist()
+    type_codes = raw_types.str.lower().map(TX_TYPE_CODES).fillna(TX_TYPE_OTHER).astype(int).tolist()
+    subtypes = _text('subtype').tolist()
+    aclasses = _text('aclass').tolist()
+    raw_assets = _text('asset')
+    assets = raw_assets.map(_ASSET_MAP).fillna(raw_assets).tolist()
+    
+    for txid, refid, ts, tx_type, type_code, subtype, aclass, asset, amt_s, fee_s, bal_s, fiat_s in zip(
+        txids, refids, timestamps, types, type_codes, subtypes, aclasses, assets, amounts, fees, balances, fiats
+    ):
         # Handle numerics
         try:
-            amt = Decimal(str(row['amount']))
-            fee = Decimal(str(row['fee']))
-            bal = Decimal(str(row['balance'])) if pd.notna(row['balance']) and row['balance'] != '' else None
-            
-            fiat = None
-            if 'amountusd' in row and pd.notna(row['amountusd']) and row['amountusd'] != '':
-                 fiat = Decimal(str(row['amountusd']))
+            amt = Decimal(amt_s)
+            fee = Decimal(fee_s)
+            bal = Decimal(bal_s) if bal_s is not None else None
+            fiat = Decimal(fiat_s) if fiat_s is not None else None
         except ValueError:
             # Log error?
             continue
-
-        tx = Transaction(
-            txid=str(row['txid']),
-            refid=str(row['refid']),
+        
+        transactions.append(Transaction(
+            txid=txid,
+            refid=refid,
             timestamp=ts,
-            type=str(row['type']),
-            subtype=str(row['subtype']),
-            asset_class=str(row['aclass']),
-            asset=clean_asset_code(str(row['asset'])),
+            type=tx_type,
+            subtype=subtype,
+            asset_class=aclass,
+            asset=asset,
             amount=amt,
             fee=fee,
             balance=bal,
-            fiat_value=fiat
-        )
-        transactions.append(tx)
+            fiat_value=fiat,
+            type_code=type_code
+        ))
         
     return transactions
 
-def load_csvs(file_paths: List[str]) -> pd.DataFrame:
+# Column types for Kraken ledger exports, so read_csv skips type inference.
+# Low-cardinality text columns load as categories (strings on the pyarrow path,
+# which cannot build a category from an all-empty column, e.g. subtype).
+KRAKEN_DTYPES = {
+    'txid': 'string',
+    'refid': 'string',
+    'type': 'category',
+    'subtype': 'category',
+    'aclass': 'category',
+    'subclass': 'category',
+    'asset': 'category',
+    'wallet': 'category',
+    'amount': 'float64',
+    'fee': 'float64',
+    'balance': 'float64',
+    'amountusd': 'float64'
+}
+KRAKEN_USECOLS = list(KRAKEN_DTYPES) + ['time']
+
+def _typed_read_kwargs(p, use_pyarrow: bool = False) -> dict:
+    """
+    dtype/usecols/parse_dates restricted to the columns this file actually has
+    (older exports lack e.g. subclass, wallet, amountusd).
+    """
+    header = set(pd.read_csv(p, nrows=0).columns)
+    if hasattr(p, 'seek'):
+        p.seek(0)
+    
+    kwargs = {
+        'usecols': [c for c in KRAKEN_USECOLS if c in header],
+        'dtype': {
+            c: 'string' if use_pyarrow and t == 'category' else t
+            for c, t in KRAKEN_DTYPES.items() if c in header
+        }
+    }
+    if 'time' in header:
+        kwargs['parse_dates'] = ['time']
+    return kwargs
+
+def load_csvs(file_paths: List[str], use_pyarrow: bool = False) -> pd.DataFrame:
     """
     Loads multiple CSV files and concatenates them into a single DataFrame.
+    Known Kraken columns are parsed with explicit dtypes (see KRAKEN_DTYPES).
+    If use_pyarrow is set, parsing uses the pyarrow engine and returns Arrow-backed columns.
     """
+    read_kwargs = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'} if use_pyarrow else {}
+    
     dfs = []
     for p in file_paths:
         try:
-            df = pd.read_csv(p)
+            df = pd.read_csv(p, **read_kwargs, **_typed_read_kwargs(p, use_pyarrow))
             # Basic cleaning if needed
             dfs.append(df)
         except Exception as e:
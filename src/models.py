@@ -3,6 +3,24 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
+# Integer codes for the (small, fixed) transaction type vocabulary, so hot loops
+# can branch on an int / bitmask instead of lower-casing and comparing strings.
+TX_TYPE_CODES = {
+    'trade': 0,
+    'withdrawal': 1,
+    'deposit': 2,
+    'transfer': 3,
+    'send': 4,
+    'spend': 5,
+    'margin': 6,
+    'settled': 7,
+    'receive': 8
+}
+TX_TYPE_OTHER = 9
+
+def tx_type_code(tx_type: str) -> int:
+    return TX_TYPE_CODES.get(tx_type.lower(), TX_TYPE_OTHER)
+
 @dataclass(frozen=True)
 class Transaction:
     """
@@ -27,3 +45,10 @@ class Transaction:
     # Financials in Fiat (USD)
     fiat_value: Optional[Decimal] = None # Total value of this transaction in USD
     spot_price_usd: Optional[Decimal] = None # Price of asset at time of tx in USD
+    
+    # Encoded `type` (see TX_TYPE_CODES); derived from `type` if not given
+    type_code: Optional[int] = None
+    
+    def __post_init__(self):
+        if self.type_code is None:
+            object.__setattr__(self, 'type_code', tx_type_code(self.type))
@@ -1,9 +1,63 @@
 import yfinance as yf
 import pandas as pd
+import hashlib
+import time
+from pathlib import Path
 from typing import List, Dict
 from datetime import datetime
+import streamlit as st
 
+# On-disk price cache, shared across sessions/restarts
+_CACHE_DIR = Path.home() / '.cache' / 'crypto-analysis'
+_CACHE_TTL_SECONDS = 3600
+
+def _cache_path(assets: List[str], start_date: datetime) -> Path:
+    key = f"{','.join(sorted(set(assets)))}|{start_date.strftime('%Y-%m-%d')}"
+    return _CACHE_DIR / f"prices_{hashlib.sha1(key.encode()).hexdigest()[:16]}.parquet"
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
 def get_historical_prices(assets: List[str], start_date: datetime) -> pd.DataFrame:
+    """
+    Fetches daily close prices for a list of assets, via a parquet cache on disk.
+    A fresh cache file (< 1h) is returned as-is; a stale one is topped up from its
+    last cached date instead of re-downloading the full history.
+    Returns a DataFrame where index is Date and columns are Asset Symbols.
+    """
+    if not assets:
+        return pd.DataFrame()
+
+    path = _cache_path(assets, start_date)
+    cached = pd.DataFrame()
+    if path.exists():
+        try:
+            cached = pd.read_parquet(path)
+        except Exception as e:
+            print(f"Error reading price cache {path}: {e}")
+
+    if not cached.empty and time.time() - path.stat().st_mtime < _CACHE_TTL_SECONDS:
+        return cached
+
+    if not cached.empty:
+        # Re-fetch from the last cached day (its close may have been intraday)
+        fresh = _download_prices(assets, cached.index.max())
+        if fresh.empty:
+            return cached
+        closes = pd.concat([cached, fresh])
+        closes = closes[~closes.index.duplicated(keep='last')].sort_index().ffill()
+    else:
+        closes = _download_prices(assets, start_date)
+        if closes.empty:
+            return closes
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        closes.to_parquet(path)
+    except Exception as e:
+        print(f"Error writing price cache {path}: {e}")
+
+    return closes
+
+def _download_prices(assets: List[str], start_date: datetime) -> pd.DataFrame:
     """
     Fetches daily close prices for a list of assets from yfinance.
     Returns a DataFrame where index is Date and columns are Asset Symbols.
@@ -40,7 +94,8 @@ def get_historical_prices(assets: List[str], start_date: datetime) -> pd.DataFra
         
         # yfinance download
         # period='max' or start=...
-        data = yf.download(valid_tickers, start=start_str, progress=False)
+        # threads=True fetches tickers concurrently; group_by='column' keeps the ['Close'][ticker] layout below
+        data = yf.download(valid_tickers, start=start_str, progress=False, threads=True, group_by='column', auto_adjust=False)
         
         if data.empty:
             return pd.DataFrame()
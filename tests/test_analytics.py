@@ -0,0 +1,26 @@
+from datetime import datetime
+import pandas as pd
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('yfinance')
+pl = pytest.importorskip('polars')
+
+from src import analytics
+from src.engine import HISTORY_COLUMNS
+
+def _history_df():
+    return pd.DataFrame.from_records([
+        (datetime(2024, 1, 1, 10), 0.0, 100.0, 100.0, {'BTC': {'qty': 1.0, 'cost_basis': 100.0}}),
+        (datetime(2024, 1, 1, 18), 0.0, 150.0, 160.0, {'BTC': {'qty': 1.5, 'cost_basis': 150.0}}),
+        (datetime(2024, 1, 4, 9), 20.0, 75.0, 90.0, {'BTC': {'qty': 0.75, 'cost_basis': 75.0}, 'ETH': {'qty': 2.0, 'cost_basis': 0.0}}),
+        (datetime(2024, 1, 6, 12), 35.0, 0.0, 0.0, {}),
+    ], columns=HISTORY_COLUMNS)
+
+def test_polars_resample_matches_pandas(monkeypatch):
+    # No external prices: compare the resampling stage only
+    monkeypatch.setattr(analytics, 'get_historical_prices', lambda assets, start_date: pd.DataFrame())
+    expected = analytics.calculate_portfolio_performance(_history_df())
+    result = analytics.calculate_portfolio_performance(_history_df(), use_polars=True)
+    assert len(expected) == 6
+    pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False)
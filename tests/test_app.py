@@ -0,0 +1,25 @@
+import importlib.util
+import math
+from datetime import datetime
+from pathlib import Path
+import pytest
+
+pytest.importorskip('streamlit')
+pytest.importorskip('yfinance')
+
+def _load_app():
+    spec = importlib.util.spec_from_file_location('crypto_analysis_app', Path(__file__).resolve().parent.parent / '__main__.py')
+    app = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app)
+    return app
+
+@pytest.mark.parametrize('missing', [None, math.nan])
+def test_build_tx_df_missing_txid(missing):
+    app = _load_app()
+    tx_df = app._build_tx_df((
+        (datetime(2024, 1, 1), 'deposit', 'BTC', '0.5', '0', '0', missing, 'R1'),
+        (datetime(2024, 1, 2), 'trade', 'BTC', '-0.25', '0', '10000', 'T2', 'R2'),
+    ))
+    assert len(tx_df) == 2
+    assert tx_df['TxID'].isna().tolist() == [True, False]
+    assert tx_df['Explorer'].isna().all()
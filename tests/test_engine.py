@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+import pytest
+from src.engine import FIFOEngine, LotBook
+from src.models import Transaction
+
+def _tx(txid, day, amount, fiat_value, tx_type='trade'):
+    return Transaction(
+        txid=txid, refid=txid, timestamp=datetime(2024, 1, 1) + timedelta(days=day - 1), type=tx_type, subtype='',
+        asset_class='currency', asset='BTC', amount=Decimal(amount), fee=Decimal('0'),
+        balance=None, fiat_value=fiat_value
+    )
+
+def test_non_finite_fiat_value_does_not_poison_totals():
+    engine = FIFOEngine([
+        _tx('T1', 1, '1', Decimal('NaN')),
+        _tx('T2', 2, '-1', Decimal('100')),
+        _tx('T3', 3, '2', Decimal('200')),
+    ])
+    engine.run()
+    last = engine.get_history_df().iloc[-1]
+    assert last['total_cost_basis'] == 200.0
+    assert last['total_market_value'] == 200.0
+    assert engine.get_realized_gains_df()['gain_usd'].tolist() == [100.0]
+
+def test_lots_beyond_initial_capacity_sell_fifo():
+    # Lot i (1-based): 1 unit at $10 * i, more lots than LotBook's initial cap
+    n_lots = 70
+    txs = [_tx(f'B{i}', i, '1', Decimal(10 * i)) for i in range(1, n_lots + 1)]
+    txs.append(_tx('S1', n_lots + 1, '-2.5', Decimal('1000')))
+    engine = FIFOEngine(txs)
+    engine.run()
+    
+    assert engine.inventory['BTC'].cap > 64
+    sale = engine.get_realized_gains_df().iloc[0]
+    assert sale['cost_basis'] == pytest.approx(10 + 20 + 0.5 * 30)
+    assert sale['gain_usd'] == pytest.approx(1000 - 45)
+    holdings = engine.get_holdings_summary().iloc[0]
+    assert holdings['Quantity'] == pytest.approx(n_lots - 2.5)
+    assert holdings['Cost Basis'] == pytest.approx(10 * n_lots * (n_lots + 1) / 2 - 45)
+    assert len(engine.inventory['BTC']) == n_lots - 2
+
+def test_lot_book_compacts_consumed_head():
+    lots = LotBook(cap=4)
+    for unit_cost in (1.0, 2.0, 3.0, 4.0):
+        lots.append(1.0, unit_cost)
+    assert lots.consume(3.0) == pytest.approx(1.0 + 2.0 + 3.0)
+    
+    # Full with a mostly consumed head: compacts in place instead of growing
+    lots.append(2.0, 5.0)
+    assert (lots.head, lots.tail, lots.cap) == (0, 2, 4)
+    assert lots.consume(2.0) == pytest.approx(4.0 + 5.0)
+    assert lots.qty[lots.head] == pytest.approx(1.0)
+    assert len(lots) == 1
+
+@pytest.mark.parametrize('tx_type, is_transfer', [
+    ('withdrawal', True), ('transfer', True), ('send', True), ('Withdrawal', True),
+    ('trade', False), ('spend', False), ('margin', False), ('settled', False),
+    ('deposit', False), ('receive', False), ('staking', False),
+])
+def test_outflow_transfer_detection(tx_type, is_transfer):
+    engine = FIFOEngine([
+        _tx('B1', 1, '1', Decimal('100')),
+        _tx('O1', 2, '-1', Decimal('150'), tx_type),
+    ], withdrawals_as_transfers=True)
+    engine.run()
+    
+    gains = engine.get_realized_gains_df()
+    if is_transfer:
+        # Non-taxable self-transfer: no gain, lot stays in inventory
+        assert gains.empty
+        assert len(engine.inventory['BTC']) == 1
+    else:
+        assert gains['gain_usd'].tolist() == [50.0]
+        assert len(engine.inventory['BTC']) == 0
+
+@pytest.mark.parametrize('tx_type', ['withdrawal', 'transfer', 'send'])
+def test_outflow_is_sale_without_withdrawals_as_transfers(tx_type):
+    engine = FIFOEngine([
+        _tx('B1', 1, '1', Decimal('100')),
+        _tx('O1', 2, '-1', Decimal('150'), tx_type),
+    ], withdrawals_as_transfers=False)
+    engine.run()
+    assert engine.get_realized_gains_df()['gain_usd'].tolist() == [50.0]
+
+@pytest.mark.parametrize('tx_type, is_return', [
+    ('deposit', True), ('transfer', True), ('receive', True), ('Deposit', True),
+    ('trade', False), ('withdrawal', False), ('send', False), ('staking', False),
+])
+def test_inflow_return_detection(tx_type, is_return):
+    engine = FIFOEngine([_tx('I1', 1, '1', Decimal('100'), tx_type)], deposits_as_transfers=True)
+    engine.run()
+    assert ('BTC' in engine.inventory) != is_return
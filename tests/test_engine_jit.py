@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from src.engine_jit import QTY_EPS, fifo_consume
+
+# The plain Python loop (what ships without numba) and, when numba is installed, the compiled kernel
+_KERNELS = [pytest.param(getattr(fifo_consume, 'py_func', fifo_consume), id='python')]
+if hasattr(fifo_consume, 'py_func'):
+    _KERNELS.append(pytest.param(fifo_consume, id='njit'))
+
+def _lots(*qty_cost):
+    qty, cost = zip(*qty_cost)
+    return np.array(qty, dtype=np.float64), np.array(cost, dtype=np.float64)
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_partial_lot(kernel):
+    qty, cost = _lots((2.0, 10.0), (1.0, 20.0))
+    total_cb, head = kernel(qty, cost, 0, 2, 0.5)
+    assert total_cb == pytest.approx(5.0)
+    assert head == 0
+    assert qty[0] == pytest.approx(1.5)
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_exact_whole_lot(kernel):
+    qty, cost = _lots((2.0, 10.0), (1.0, 20.0))
+    total_cb, head = kernel(qty, cost, 0, 2, 2.0)
+    assert total_cb == pytest.approx(20.0)
+    assert head == 1
+    assert qty[1] == 1.0
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_across_lots_from_head(kernel):
+    qty, cost = _lots((9.0, 1.0), (1.0, 10.0), (2.0, 20.0), (3.0, 30.0))
+    total_cb, head = kernel(qty, cost, 1, 4, 2.0)
+    assert total_cb == pytest.approx(10.0 + 20.0)
+    assert head == 2
+    assert qty[2] == pytest.approx(1.0)
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_dust_within_eps_consumes_lot(kernel):
+    qty, cost = _lots((1.0 + QTY_EPS / 2, 10.0), (1.0, 20.0))
+    total_cb, head = kernel(qty, cost, 0, 2, 1.0)
+    assert head == 1
+    assert total_cb == pytest.approx(10.0)
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_remainder_beyond_eps_stays(kernel):
+    qty, cost = _lots((1.0 + 1e-9, 10.0),)
+    total_cb, head = kernel(qty, cost, 0, 1, 1.0)
+    assert head == 0
+    assert qty[0] == pytest.approx(1e-9)
+
+@pytest.mark.parametrize('kernel', _KERNELS)
+def test_oversell_stops_at_tail(kernel):
+    qty, cost = _lots((1.0, 10.0), (1.0, 20.0))
+    total_cb, head = kernel(qty, cost, 0, 2, 5.0)
+    assert total_cb == pytest.approx(30.0)
+    assert head == 2
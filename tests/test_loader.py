@@ -0,0 +1,40 @@
+from src.loader import load_csvs, parse_kraken_ledger
+
+LEDGER_HEADER = '"txid","refid","time","type","subtype","aclass","subclass","asset","wallet","amount","fee","balance","amountusd"\n'
+
+def _write_ledger(tmp_path, rows, header=LEDGER_HEADER):
+    path = tmp_path / 'ledger.csv'
+    path.write_text(header + ''.join(row + '\n' for row in rows))
+    return str(path)
+
+def test_load_csvs_pyarrow_all_empty_subtype(tmp_path):
+    path = _write_ledger(tmp_path, [
+        '"T1","R1","2024-01-01 10:00:00","trade","","currency","crypto","XXBT","spot / main",0.5,0,0.5,20000',
+        '"T2","R2","2024-01-02 10:00:00","trade","","currency","crypto","XXBT","spot / main",-0.25,0,0.25,10000',
+    ])
+    df = load_csvs([path], use_pyarrow=True)
+    assert len(df) == 2
+    assert df['subtype'].isna().all()
+    assert len(parse_kraken_ledger(df)) == 2
+
+def test_parse_empty_amountusd_is_none(tmp_path):
+    path = _write_ledger(tmp_path, [
+        '"T1","R1","2024-01-01 10:00:00","trade","","currency","crypto","XXBT","spot / main",0.5,0,,',
+        '"T2","R2","2024-01-02 10:00:00","trade","","currency","crypto","XXBT","spot / main",-0.25,0,0.25,10000',
+    ])
+    for use_pyarrow in (False, True):
+        txs = parse_kraken_ledger(load_csvs([path], use_pyarrow=use_pyarrow))
+        assert txs[0].fiat_value is None
+        assert txs[0].balance is None
+        assert txs[1].fiat_value == 10000
+
+def test_parse_empty_text_cells_are_str(tmp_path):
+    path = _write_ledger(tmp_path, [
+        '"","","2024-01-01 10:00:00","deposit","","currency","crypto","XXBT","spot / main",0.5,0,0.5,20000',
+    ])
+    for use_pyarrow in (False, True):
+        tx, = parse_kraken_ledger(load_csvs([path], use_pyarrow=use_pyarrow))
+        for value in (tx.txid, tx.refid, tx.type, tx.subtype, tx.asset_class, tx.asset):
+            assert isinstance(value, str)
+        assert tx.txid == tx.refid == tx.subtype == ''
+        assert tx.asset == 'BTC'
@@ -0,0 +1,23 @@
+from datetime import datetime
+from decimal import Decimal
+import pytest
+from src.models import TX_TYPE_CODES, TX_TYPE_OTHER, Transaction, tx_type_code
+
+@pytest.mark.parametrize('tx_type', sorted(TX_TYPE_CODES))
+def test_known_types_map_case_insensitively(tx_type):
+    assert tx_type_code(tx_type) == TX_TYPE_CODES[tx_type]
+    assert tx_type_code(tx_type.upper()) == TX_TYPE_CODES[tx_type]
+
+@pytest.mark.parametrize('tx_type', ['staking', 'earn', 'adjustment', 'rollover', ''])
+def test_unknown_types_map_to_other(tx_type):
+    assert tx_type_code(tx_type) == TX_TYPE_OTHER
+
+def test_type_codes_are_distinct_bits():
+    assert len(set(TX_TYPE_CODES.values()) | {TX_TYPE_OTHER}) == len(TX_TYPE_CODES) + 1
+
+def test_transaction_derives_type_code():
+    tx = Transaction(
+        txid='T1', refid='R1', timestamp=datetime(2024, 1, 1), type='Send', subtype='',
+        asset_class='currency', asset='BTC', amount=Decimal('-1'), fee=Decimal('0'), balance=None
+    )
+    assert tx.type_code == TX_TYPE_CODES['send']